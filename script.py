@@ -3,14 +3,54 @@ import importlib.util
 import subprocess
 import sys
 import os
+import time
+import hashlib
+from pathlib import Path
+
+# Touched after a successful check; skips the whole check while fresh.
+# Keyed by sys.prefix so each interpreter/venv is verified on its own.
+DEPS_SENTINEL = Path.home() / ".cache" / (
+    "calebbot_deps_ok_" + hashlib.sha1(sys.prefix.encode("utf-8")).hexdigest()[:12]
+)
+DEPS_SENTINEL_MAX_AGE_S = 7 * 24 * 3600
+
+def ensure_packages(packages):
+    """Check which packages are missing and install them in one pip call."""
+    missing = [install_name for pkg_name, install_name in packages.items()
+               if importlib.util.find_spec(pkg_name) is None]
+    if missing:
+        print(f"🔧 Installing missing packages: {', '.join(missing)} ...")
+        subprocess.run([sys.executable, "-m", "pip", "install", "--upgrade", *missing], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+
+def deps_recently_verified() -> bool:
+    """True if a previous run verified dependencies within the last week."""
+    try:
+        return time.time() - os.path.getmtime(DEPS_SENTINEL) < DEPS_SENTINEL_MAX_AGE_S
+    except OSError:
+        return False
+
+def verify_dependencies():
+    """Installs missing packages and browsers, then records success."""
+    print("Verifying dependencies...")
+    ensure_packages(required_packages)
 
-def ensure_package(pkg_name, install_name=None):
-    """Check if a package is installed; if not, install it."""
-    if install_name is None:
-        install_name = pkg_name
-    if importlib.util.find_spec(pkg_name) is None:
-        print(f"🔧 Installing missing package: {install_name} ...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "--upgrade", install_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    # Install Playwright browsers if not already installed
+    try:
+        # Check if browsers are installed by trying a dry-run
+        check_path = subprocess.run([sys.executable, "-m", "playwright", "install", "--dry-run"], check=True, capture_output=True, text=True)
+        if "chromium" not in check_path.stdout:
+            raise Exception("Browsers not found")
+    except Exception:
+        print("⚙️ Installing Playwright browsers (chromium, firefox, webkit)...")
+        subprocess.run([sys.executable, "-m", "playwright", "install", "--with-deps"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+
+    try:
+        DEPS_SENTINEL.parent.mkdir(parents=True, exist_ok=True)
+        DEPS_SENTINEL.touch()
+    except OSError:
+        pass # Just means we check again next launch
+
+    print("✅ All dependencies verified and ready.")
 
 # Required packages
 required_packages = {
@@ -19,36 +59,28 @@ required_packages = {
     "requests": "requests",
 }
 
-print("Verifying dependencies...")
-for pkg, install_name in required_packages.items():
-    ensure_package(pkg, install_name)
-
-# Install Playwright browsers if not already installed
-try:
-    # Check if browsers are installed by trying a dry-run
-    check_path = subprocess.run([sys.executable, "-m", "playwright", "install", "--dry-run"], check=True, capture_output=True, text=True)
-    if "chromium" not in check_path.stdout:
-        raise Exception("Browsers not found")
-except Exception:
-    print("⚙️ Installing Playwright browsers (chromium, firefox, webkit)...")
-    subprocess.run([sys.executable, "-m", "playwright", "install", "--with-deps"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-
-print("✅ All dependencies verified and ready.")
+if not deps_recently_verified():
+    verify_dependencies()
 
 # --- Core Imports ---
 import random
-import secrets
 import string
-import time
 import csv
+import json
+import re
 import logging
+import operator
+import functools
+import itertools
+import threading
+import socket
 import traceback
 from logging.handlers import RotatingFileHandler
-from datetime import datetime
-from pathlib import Path
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from typing import List, Optional, Dict, Any, Iterable, Iterator
 
 from playwright.sync_api import (
     sync_playwright,
@@ -56,12 +88,16 @@ from playwright.sync_api import (
     Browser,
     BrowserContext,
     Page,
+    Locator,
+    Response,
     TimeoutError as PlaywrightTimeoutError,
     Route,
-    Request
 )
 from faker import Faker
 
+# Main bot logger, resolved once
+_LOG = logging.getLogger("AccountCreatorBot")
+
 # --- Config ---
 @dataclass
 class BotConfig:
@@ -75,6 +111,10 @@ class BotConfig:
     MAX_NAV_RETRIES: int = 3
     GOTO_TIMEOUT_MS: int = 45_000
     ACTION_TIMEOUT_MS: int = 20_000
+    SEND_CODE_TIMEOUT_MS: int = 10_000 # Upper bound on waiting for the SMS request
+    MAX_WORKERS: int = 1 # Accounts processed concurrently, one browser context each
+    CDP_PORT: int = 0 # Debugging port extra workers use to share the browser (0 = any free port)
+    CDP_CONNECT_RETRIES: int = 5 # Attempts a worker makes to (re)attach to the shared browser
     
     COUNTRIES: List[str] = [
         "Egypt", "Saudi Arabia", "Singapore",
@@ -83,6 +123,7 @@ class BotConfig:
     
     MIN_DELAY_ACTION: float = 0.05
     MAX_DELAY_ACTION: float = 0.25
+    HUMANIZE_TYPING: bool = False # Type char-by-char for sites that detect fill()
     
     KEEP_BROWSER_OPEN_ON_SUCCESS: bool = False
     
@@ -105,7 +146,7 @@ class AccountData:
 
 def setup_logging(log_file: str) -> logging.Logger:
     """Sets up the global rotating file + console logger."""
-    logger = logging.getLogger("AccountCreatorBot")
+    logger = _LOG
     if logger.hasHandlers():
         return logger # Already set up
         
@@ -123,47 +164,156 @@ def setup_logging(log_file: str) -> logging.Logger:
     
     return logger
 
-def read_numbers_file(file_path: str) -> List[str]:
-    """Reads a list of phone numbers from a file."""
-    log = logging.getLogger("AccountCreatorBot") # Use main logger
+def iter_numbers_file(file_path: str, log: logging.Logger = _LOG) -> Iterator[str]:
+    """Yields phone numbers from a file, one per non-empty line."""
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            numbers = [line.strip() for line in f if line.strip()]
-        log.info("Loaded %d phone numbers from %s", len(numbers), file_path)
-        return numbers
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
     except FileNotFoundError:
         log.warning("Numbers file not found: %s. Will run 1x without phone.", file_path)
-        return []
     except Exception as e:
         log.exception("Error reading numbers file: %s", e)
-        return []
 
 def jitter_sleep(min_s: float, max_s: float):
     """Sleeps for a random duration."""
     time.sleep(random.uniform(min_s, max_s))
 
+@functools.lru_cache(maxsize=None)
+def country_option_selector(country: str) -> str:
+    """Builds the dropdown-option selector for a country (cached per country)."""
+    name = json.dumps(country, ensure_ascii=False) # CSS doesn't understand \uXXXX escapes
+    return f"div[role='option']:has-text({name}), .css-54kpfw:has-text({name})"
+
+# Injected once per context; pages call window.__selectCountry(name)
+SELECT_COUNTRY_INIT_SCRIPT = """
+window.__selectCountry = (name) => {
+    const wanted = String(name).toLowerCase();
+    const options = document.querySelectorAll('div[role="option"], .css-54kpfw');
+    for (const el of options) {
+        const txt = (el.innerText || '').trim().toLowerCase();
+        if (txt === wanted) {
+            el.click();
+            return true;
+        }
+    }
+    return false;
+};
+"""
+
+# Wipes the current origin's client-side storage between accounts
+CLEAR_STORAGE_SCRIPT = """
+async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (window.indexedDB && indexedDB.databases) {
+        const dbs = await indexedDB.databases();
+        await Promise.all(dbs.map(db => new Promise(done => {
+            const req = indexedDB.deleteDatabase(db.name);
+            req.onsuccess = req.onerror = req.onblocked = () => done();
+        })));
+    }
+}
+"""
+
+# Injected once per context: strips heavy/distracting elements and dismisses
+# popups while the signup form is in use, without a round-trip from Python. It
+# keeps catching banners/dialogs that load after the form, and stops after a
+# deadline or as soon as the phone-verification step appears.
+PAGE_CLEANUP_INIT_SCRIPT = """
+(() => {
+    const CLOSE_TEXTS = ['close', 'dismiss', 'not now'];
+    const PHONE_INPUT = "input[placeholder='Phone number']";
+    const DEADLINE_MS = 10000;
+    const clicked = new WeakSet();
+    let scheduled = false;
+    let observer = null;
+    const clean = () => {
+        scheduled = false;
+        try {
+            document.querySelectorAll('video, audio, iframe, .chat-widget, .chatbot, .cookie-banner').forEach(el => el.remove());
+            document.querySelectorAll('button').forEach(btn => {
+                if (clicked.has(btn)) return;
+                const dialog = btn.closest('[role="dialog"]');
+                if (dialog && dialog.querySelector(PHONE_INPUT)) return;
+                const txt = (btn.innerText || '').trim().toLowerCase();
+                if (btn.getAttribute('aria-label') === 'Close' || CLOSE_TEXTS.includes(txt)) {
+                    clicked.add(btn);
+                    btn.click();
+                }
+            });
+        } catch (e) {}
+    };
+    const stop = () => {
+        if (observer) { observer.disconnect(); observer = null; }
+    };
+    const schedule = () => {
+        if (scheduled || !observer) return;
+        scheduled = true;
+        setTimeout(() => {
+            if (document.querySelector(PHONE_INPUT)) return stop();
+            clean();
+        }, 50);
+    };
+    document.addEventListener('DOMContentLoaded', () => {
+        const style = document.createElement('style');
+        style.innerText = '* { animation: none !important; transition: none !important; }';
+        document.head && document.head.appendChild(style);
+        if (document.querySelector(PHONE_INPUT)) return;
+        clean();
+        observer = new MutationObserver(schedule);
+        observer.observe(document.documentElement, { childList: true, subtree: true });
+        setTimeout(stop, DEADLINE_MS);
+    });
+})();
+"""
+
 # --- Data Generation ---
 
 class DataGenerator:
     """Generates fake user data for signups."""
+    _ALNUM = string.ascii_letters + string.digits
+    _SPECIALS = "!@#$%&*()_+-=<>?@!$!"
+    _DOMAINS = ("gmail.com", "outlook.com", "hotmail.com", "yahoo.com")
+    # Local-part builders; only the chosen one is evaluated
+    _EMAIL_PATTERNS = (
+        lambda f, l: f"{f}.{l}{random.randint(10,99)}",
+        lambda f, l: f"{f}{l}{random.randint(1,9999)}",
+        lambda f, l: f"{f}_{l}{random.randint(1,99)}",
+        lambda f, l: f"{f}{random.randint(100,999)}",
+    )
+
     def __init__(self, countries: List[str]):
-        self.fake = Faker()
+        self._fake: Optional[Faker] = None
         self.countries = countries
-        self.log = logging.getLogger(f"{self.__class__.__name__}")
+
+    @property
+    def fake(self) -> Faker:
+        """Faker instance, built on first use with only the person provider."""
+        if self._fake is None:
+            self._fake = Faker("en_US", providers=["faker.providers.person"])
+        return self._fake
 
     def _generate_strong_password(self) -> str:
         """Generates a complex, randomized password."""
-        specials = "!@#$%&*()_+-=<>?@!$!"
         base_len = random.randint(8, 11)
-        base = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(base_len))
-
-        # Ensure complexity
-        if not any(c.isupper() for c in base): base = 'S' + base[1:]
-        if not any(c.islower() for c in base): base = base[:-1] + 'a'
-        if not any(c.isdigit() for c in base): base = base + str(random.randint(1,9))
-
-        num_specials = random.randint(3, 6)
-        specials_part = ''.join(secrets.choice(specials) for _ in range(num_specials))
+        base = ''.join(random.choices(self._ALNUM, k=base_len))
+
+        # Ensure complexity (single pass over base)
+        has_upper = has_lower = has_digit = False
+        for c in base:
+            if c.isupper(): has_upper = True
+            elif c.islower(): has_lower = True
+            else: has_digit = True
+        if not has_upper: base = 'S' + base
+        if not has_lower: base = base + 'a'
+        if not has_digit: base = base + str(random.randint(1,9))
+
+        # Fit the specials into the cap so truncation never drops a required class
+        num_specials = random.randint(3, min(6, 18 - len(base)))
+        specials_part = ''.join(random.choices(self._SPECIALS, k=num_specials))
         
         insert_pos = random.randint(1, max(1, len(base)-1))
         password = base[:insert_pos] + specials_part + base[insert_pos:]
@@ -174,12 +324,8 @@ class DataGenerator:
         """Generates a realistic-looking email."""
         f = first.lower().replace(" ", "")
         l = last.lower().replace(" ", "")
-        patterns = [
-            f"{f}.{l}{random.randint(10,99)}", f"{f}{l}{random.randint(1,9999)}",
-            f"{f}_{l}{random.randint(1,99)}", f"{f}{random.randint(100,999)}",
-        ]
-        pattern = random.choice(patterns)
-        domain = random.choice(["gmail.com", "outlook.com", "hotmail.com", "yahoo.com"])
+        pattern = random.choice(self._EMAIL_PATTERNS)(f, l)
+        domain = random.choice(self._DOMAINS)
         return f"{pattern}@{domain}"
 
     def generate_account_data(self, phone_number: Optional[str]) -> AccountData:
@@ -189,9 +335,10 @@ class DataGenerator:
         email = self._generate_realistic_email(first, last)
         password = self._generate_strong_password()
         country = random.choice(self.countries)
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
         
-        self.log.debug("Generated data for: %s", email)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Generated data for: %s", email)
         return AccountData(
             first_name=first, last_name=last, email=email,
             password=password, country=country, phone=phone_number,
@@ -206,112 +353,280 @@ class IOutputWriter(ABC):
     def write_row(self, data: Dict[str, Any]):
         pass
 
+    def close(self):
+        """Flushes and releases any held resources."""
+        pass
+
 class CsvOutputWriter(IOutputWriter):
     """CSV file implementation of IOutputWriter."""
+    FLUSH_EVERY: int = 32 # Rows buffered before an explicit flush
+
     def __init__(self, filename: str, fieldnames: List[str]):
         self.filename = Path(filename)
         self.fieldnames = fieldnames
         self.log = logging.getLogger(f"{self.__class__.__name__}")
+        self._pending = 0
+        self._lock = threading.Lock() # Rows may come from several workers
+        # Pulls row values out in header order; missing fields fall back to ""
+        getter = operator.itemgetter(*fieldnames)
+        self._field_getter = getter if len(fieldnames) > 1 else (lambda row: (getter(row),))
+        self._defaults = dict.fromkeys(fieldnames, "")
         self._initialize_file()
 
     def _initialize_file(self):
-        """Creates the CSV and writes the header if it doesn't exist."""
-        if not self.filename.exists():
+        """Opens the CSV once for appending, writing the header if it's new."""
+        is_new = not self.filename.exists()
+        if is_new:
             self.log.info("Creating new output CSV: %s", self.filename)
-            try:
-                with open(self.filename, "w", newline="", encoding="utf-8") as fh:
-                    writer = csv.DictWriter(fh, fieldnames=self.fieldnames)
-                    writer.writeheader()
-            except IOError as e:
-                self.log.exception("Failed to initialize CSV file: %s", e)
-                raise
+        try:
+            self._fh = open(self.filename, "a", newline="", encoding="utf-8", buffering=1 << 16)
+            self._csvw = csv.writer(self._fh)
+            if is_new:
+                self._csvw.writerow(self.fieldnames)
+                self._fh.flush()
+        except IOError as e:
+            self.log.exception("Failed to initialize CSV file: %s", e)
+            raise
 
     def write_row(self, data: Dict[str, Any]):
-        """Appends a single row to the CSV."""
+        """Appends a single row to the CSV, flushing in batches."""
         try:
-            with open(self.filename, "a", newline="", encoding="utf-8") as fh:
-                writer = csv.DictWriter(fh, fieldnames=self.fieldnames)
-                writer.writerow(data)
+            with self._lock:
+                self._csvw.writerow(self._field_getter({**self._defaults, **data}))
+                self._pending += 1
+                if self._pending >= self.FLUSH_EVERY:
+                    self._fh.flush()
+                    self._pending = 0
         except IOError as e:
             self.log.exception("Failed to write row to CSV: %s", data.get("email"))
         except Exception as e:
             self.log.exception("Unhandled error writing CSV row: %s", e)
 
+    def close(self):
+        """Flushes buffered rows and closes the file."""
+        with self._lock:
+            if self._fh.closed:
+                return
+            try:
+                self._fh.flush()
+                self._fh.close()
+            except IOError as e:
+                self.log.exception("Failed to close CSV file: %s", e)
+            self._pending = 0
+
 # --- Browser Management ---
 
 class BrowserManager:
     """Handles browser launch, context creation, and cleanup."""
-    def __init__(self, playwright: Playwright, config: BotConfig):
+    BLOCKED_HOSTS = frozenset({
+        "google-analytics.com", "googletagmanager.com", "hotjar.com",
+        "facebook.net", "doubleclick.net", "bing.com", "quantserve.com"
+    })
+    # Matches a blocked host or any of its subdomains, on the host part only
+    BLOCKED_HOST_RE = re.compile(
+        r"^[a-z][a-z0-9+.-]*://(?:[^/?#@]*@)?(?:[^/?#:@]*\.)?(?:"
+        + "|".join(host.replace(".", r"\.") for host in sorted(BLOCKED_HOSTS)) # Also a valid JS regex
+        + r")(?::\d+)?(?:[/?#]|$)",
+        re.IGNORECASE,
+    )
+    BLOCKED_EXTENSIONS = (
+        "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+        "mp4", "webm", "mp3", "woff", "woff2", "ttf", "otf"
+    )
+    # Matches heavy assets by path extension (any case, optional query/fragment),
+    # plus Next.js' extension-less image optimizer endpoint
+    BLOCKED_ASSET_RE = re.compile(
+        r"^[^?#]*(?:\.(?:" + "|".join(BLOCKED_EXTENSIONS) + r")|/_next/image)(?:[?#].*)?$",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, playwright: Playwright, config: BotConfig,
+                 cdp_endpoint: Optional[str] = None):
         self.playwright = playwright
         self.config = config
+        self.cdp_endpoint = cdp_endpoint # If set, attach to this browser instead of launching
+        self.debugging_port: Optional[int] = None # Chosen on first launch, kept for relaunches
         self.browser: Optional[Browser] = None
+        self.shared_context: Optional[BrowserContext] = None
+        self._ua: str = playwright.devices['Desktop Chrome']['user_agent']
         self.log = logging.getLogger(f"{self.__class__.__name__}")
 
+    @property
+    def owns_browser(self) -> bool:
+        """True if this manager launched the browser (False for CDP workers)."""
+        return self.cdp_endpoint is None
+
+    @property
+    def debugging_endpoint(self) -> str:
+        """CDP endpoint of the browser this manager launches for other workers."""
+        if self.debugging_port is None:
+            raise Exception("BrowserNotSharedOverCDP")
+        return f"http://127.0.0.1:{self.debugging_port}"
+
+    def _reserve_debugging_port(self) -> int:
+        """Returns a free port for --remote-debugging-port.
+
+        Keeps the port picked on first launch, otherwise uses CDP_PORT (0 lets
+        the OS choose). Fails if it's taken, so workers can't end up attached
+        to some other Chrome listening there.
+        """
+        port = self.debugging_port or self.config.CDP_PORT
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            # Tolerate TIME_WAIT leftovers from a crashed browser's CDP clients;
+            # a live listener on the port still makes bind() fail
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind(("127.0.0.1", port))
+            except OSError as e:
+                raise Exception(f"CDPPortInUse:{port}") from e
+            return sock.getsockname()[1]
+
+    def _connect_over_cdp(self):
+        """Attaches to the shared browser, backing off while it (re)starts."""
+        for attempt in range(1, self.config.CDP_CONNECT_RETRIES + 1):
+            try:
+                self.log.info("Connecting to shared browser at %s...", self.cdp_endpoint)
+                self.browser = self.playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+                return
+            except Exception as e:
+                if attempt == self.config.CDP_CONNECT_RETRIES:
+                    raise
+                backoff = min(2 * attempt, 8)
+                self.log.warning("CDP connect attempt %d failed (%s); backing off %ds", attempt, e, backoff)
+                time.sleep(backoff + random.uniform(0, 0.5))
+
     def launch(self):
-        """Launches the Chromium browser."""
+        """Launches the Chromium browser, or connects to the shared one."""
         if self.browser:
             return # Already launched
         try:
+            if not self.owns_browser:
+                self._connect_over_cdp()
+                return
+
+            args = []
+            if self.config.MAX_WORKERS > 1:
+                self.debugging_port = self._reserve_debugging_port()
+                args.append(f"--remote-debugging-port={self.debugging_port}")
             self.log.info("Launching browser (Headless: %s)...", self.config.HEADLESS)
             self.browser = self.playwright.chromium.launch(
                 headless=self.config.HEADLESS,
-                slow_mo=0
+                slow_mo=0,
+                args=args
             )
         except Exception as e:
             self.log.exception("Failed to launch browser: %s", e)
             raise
 
     def _setup_request_blocking(self, context: BrowserContext):
-        """Block heavy/tracker resources to speed up page loads."""
-        blocked_resource_types = ["image", "media", "font"]
-        blocked_hosts = [
-            "google-analytics.com", "googletagmanager.com", "hotjar.com",
-            "facebook.net", "doubleclick.net", "bing.com", "quantserve.com"
-        ]
-        
-        def route_handler(route: Route, request: Request):
-            try:
-                if request.resource_type in blocked_resource_types:
-                    return route.abort()
-                if any(host in request.url.lower() for host in blocked_hosts):
-                    return route.abort()
-                return route.continue_()
-            except Exception:
-                try: route.continue_() # Failsafe
-                except Exception: pass
+        """Block heavy/tracker resources to speed up page loads.
+
+        Only URLs matching these patterns are routed to Python at all; every
+        other request is let through by Playwright without a callback.
+        """
+        patterns = [self.BLOCKED_ASSET_RE, self.BLOCKED_HOST_RE]
+
+        def abort_handler(route: Route):
+            try: route.abort()
+            except Exception: pass # Request already gone
 
         try:
-            context.route("**/*", route_handler)
-            self.log.debug("Request blocking configured.")
+            for pattern in patterns:
+                context.route(pattern, abort_handler)
+            self.log.debug("Request blocking configured (%d patterns).", len(patterns))
         except Exception as e:
             self.log.exception("Failed to setup request blocking: %s", e)
 
+    def _install_init_scripts(self, context: BrowserContext):
+        """Registers page helpers that run on every new document."""
+        try:
+            context.add_init_script(SELECT_COUNTRY_INIT_SCRIPT)
+            context.add_init_script(PAGE_CLEANUP_INIT_SCRIPT)
+        except Exception as e:
+            self.log.exception("Failed to install init scripts: %s", e)
+
+    def ensure_browser(self):
+        """Relaunches (or, for workers, reconnects) only if the browser connection is gone.
+
+        A live browser is never restarted here, since CDP workers may share it.
+        """
+        if self.browser and self.browser.is_connected():
+            return
+        self.log.warning("Browser connection lost; %s...",
+                         "relaunching" if self.owns_browser else "reconnecting")
+        self.shutdown()
+        self.launch()
+
+    def recover(self):
+        """Handles a 'Target closed'-style error: drops this manager's context
+        and restores the browser connection if (and only if) it died."""
+        if self.shared_context is not None:
+            self.close_context(self.shared_context)
+            self.shared_context = None
+        self.ensure_browser()
+
     def new_context(self) -> BrowserContext:
         """Creates a new, isolated browser context with optimizations."""
-        if not self.browser:
-            self.log.error("Browser not launched. Call launch() first.")
-            raise Exception("BrowserNotLaunched")
-            
+        self.ensure_browser()
         try:
             context = self.browser.new_context(
                 viewport={"width": 1200, "height": 820},
                 java_script_enabled=True,
-                user_agent=self.playwright.devices['Desktop Chrome']['user_agent']
+                user_agent=self._ua
             )
             self._setup_request_blocking(context)
+            self._install_init_scripts(context)
             return context
         except Exception as e:
             self.log.exception("Failed to create new context: %s", e)
-            self.log.warning("Attempting to relaunch browser...")
-            self.shutdown()
-            self.launch()
+            self.ensure_browser()
             # Retry once
             context = self.browser.new_context(
                 viewport={"width": 1200, "height": 820}
             )
             self._setup_request_blocking(context)
-            self.log.info("Successfully created context after relaunch.")
+            self._install_init_scripts(context)
+            self.log.info("Successfully created context on retry.")
             return context
+
+    def get_or_create_shared_context(self) -> BrowserContext:
+        """Returns the long-lived context, creating it on first use.
+
+        Accounts only open a fresh page in it; cookies are cleared between
+        accounts instead of rebuilding the whole context.
+        """
+        if self.shared_context is None:
+            self.shared_context = self.new_context()
+            self.log.debug("Shared browser context created.")
+        return self.shared_context
+
+    def reset_shared_context(self, page: Optional[Page] = None):
+        """Clears cookies and the page's localStorage, sessionStorage and IndexedDB.
+
+        Storage can only be wiped for the page's current origin, so if the page
+        left the signup site (or clearing fails) the context is dropped instead
+        and the next account gets a fresh one.
+        """
+        if self.shared_context is None:
+            return
+        try:
+            host = urlsplit(page.url).netloc if page is not None else ""
+            if host: # Empty for about:blank, i.e. never reached the site
+                if host != urlsplit(self.config.SIGNUP_URL).netloc:
+                    raise Exception(f"PageLeftSignupOrigin:{page.url.split('?')[0]}")
+                page.evaluate(CLEAR_STORAGE_SCRIPT)
+            self.shared_context.clear_cookies()
+        except Exception as e:
+            self.log.warning("Failed to clear session state, dropping shared context: %s", e)
+            self.close_context(self.shared_context)
+            self.shared_context = None
+
+    def close_page(self, page: Page):
+        """Safely closes a page."""
+        try:
+            page.close()
+        except Exception as e:
+            self.log.warning("Exception while closing page: %s", e)
     
     def close_context(self, context: BrowserContext):
         """Safely closes a browser context."""
@@ -321,7 +636,8 @@ class BrowserManager:
             self.log.warning("Exception while closing context: %s", e)
 
     def shutdown(self):
-        """Closes the browser."""
+        """Closes the browser (or just disconnects, if it's shared)."""
+        self.shared_context = None # Owned by the browser
         if self.browser:
             try:
                 self.browser.close()
@@ -333,7 +649,10 @@ class BrowserManager:
 # --- Page Objects ---
 
 class BasePage:
-    """Base Page Object with common helpers (goto, popups, etc)."""
+    """Base Page Object with common helpers (goto, text entry, etc).
+
+    Popups and heavy elements are handled by the context's init scripts.
+    """
     def __init__(self, page: Page, config: BotConfig):
         self.page = page
         self.config = config
@@ -342,17 +661,20 @@ class BasePage:
         self.min_delay = self.config.MIN_DELAY_ACTION
         self.max_delay = self.config.MAX_DELAY_ACTION
     
-    def robust_goto(self, url: str) -> bool:
-        """Wrapper for page.goto() with retries and backoff."""
+    def robust_goto(self, url: str, ready: Optional[Locator] = None) -> bool:
+        """Wrapper for page.goto() with retries and backoff.
+
+        If `ready` is given, also waits (briefly) for it to become visible.
+        """
         last_exc = None
         for attempt in range(1, self.config.MAX_NAV_RETRIES + 1):
             try:
                 self.page.goto(url, timeout=self.config.GOTO_TIMEOUT_MS, wait_until="load")
-                try:
-                    self.page.wait_for_load_state("networkidle", timeout=2000)
-                except PlaywrightTimeoutError:
-                    pass # 'load' is good enough
-                self._optimize_loaded_page()
+                if ready is not None:
+                    try:
+                        ready.wait_for(state="visible", timeout=3000)
+                    except PlaywrightTimeoutError:
+                        pass # 'load' is good enough
                 return True
             except PlaywrightTimeoutError as te:
                 last_exc = te
@@ -367,43 +689,15 @@ class BasePage:
         self.log.error("Navigation failed after %d attempts. Last error: %s", self.config.MAX_NAV_RETRIES, repr(last_exc))
         return False
 
-    def _optimize_loaded_page(self):
-        """Run JS to kill videos, iframes, animations, and overlays."""
-        try:
-            script = """
-            (() => {
-                try {
-                    document.querySelectorAll('video, audio, iframe').forEach(el => el.remove());
-                    const css = `* { animation: none !important; transition: none !imporant; }`;
-                    const style = document.createElement('style');
-                    style.innerText = css;
-                    document.head && document.head.appendChild(style);
-                    document.querySelectorAll('.chat-widget, .chatbot, .cookie-banner').forEach(el => el.remove());
-                    return true;
-                } catch(e) { return false; }
-            })();
-            """
-            self.page.evaluate(script)
-            jitter_sleep(0.05, 0.12)
-            self.log.debug("Page optimizations applied.")
-        except Exception as e:
-            self.log.warning("Failed to apply page optimizations: %s", e)
-
-    def close_common_popups(self):
-        """Best-effort attempt to click common close/dismiss buttons."""
-        selectors = [
-            "button[aria-label='Close']", "button:has-text('Close')",
-            "button:has-text('Dismiss')", "button:has-text('Not now')",
-            "div[role='dialog'] button:has-text('Close')"
-        ]
-        for sel in selectors:
-            try:
-                loc = self.page.locator(sel)
-                if loc.count() > 0:
-                    loc.first.click(timeout=1200)
-                    jitter_sleep(0.03, 0.08)
-            except Exception:
-                pass # Ignore errors
+    def enter_text(self, locator: Locator, text: str, event: str = "input"):
+        """Fills a field in one call, then fires `event` for framework listeners."""
+        if self.config.HUMANIZE_TYPING:
+            locator.fill("")
+            for ch in text:
+                locator.type(ch, delay=random.randint(6, 18))
+            return
+        locator.fill(text)
+        locator.dispatch_event(event)
 
 
 class SignUpPage(BasePage):
@@ -421,20 +715,17 @@ class SignUpPage(BasePage):
 
     def navigate(self) -> bool:
         self.log.info("Navigating to signup URL...")
-        return self.robust_goto(self.config.SIGNUP_URL)
+        return self.robust_goto(self.config.SIGNUP_URL, ready=self.first_name_input)
 
     def _select_country_by_typing(self, country: str) -> bool:
         """Strategy 1: Type and click exact match."""
         try:
             self.country_input.click(timeout=2000)
             jitter_sleep(0.02, 0.06)
-            self.country_input.fill("", timeout=800)
-            for ch in country:
-                self.country_input.type(ch, delay=random.randint(6, 18))
+            self.enter_text(self.country_input, country)
             jitter_sleep(0.02, 0.06)
             
-            option_selector = f"div[role='option']:has-text('{country}'), .css-54kpfw:has-text('{country}')"
-            option = self.page.locator(option_selector).first
+            option = self.page.locator(country_option_selector(country)).first
             option.wait_for(state="visible", timeout=3000)
             option.click()
             jitter_sleep(0.02, 0.06)
@@ -447,21 +738,7 @@ class SignUpPage(BasePage):
         try:
             self.country_input.click(timeout=1200)
             jitter_sleep(0.02, 0.05)
-            script = f"""
-            (() => {{
-                const name = "{country}".toLowerCase();
-                const options = Array.from(document.querySelectorAll('div[role="option"], .css-54kpfw'));
-                for (const el of options) {{
-                    const txt = (el.innerText || '').trim().toLowerCase();
-                    if (txt === name) {{
-                        el.click();
-                        return true;
-                    }}
-                }}
-                return false;
-            }})();
-            """
-            if self.page.evaluate(script):
+            if self.page.evaluate("name => window.__selectCountry(name)", country):
                 jitter_sleep(0.02, 0.05)
                 return True
             return False
@@ -486,9 +763,6 @@ class SignUpPage(BasePage):
     def fill_form(self, data: AccountData) -> bool:
         """Fills the entire signup form."""
         try:
-            self.close_common_popups()
-            jitter_sleep(0.05, 0.12)
-            
             if not self.select_country(data.country):
                 self.log.warning("Country selection failed, proceeding anyway...")
             
@@ -537,23 +811,45 @@ class PhoneVerificationPage(BasePage):
             self.log.warning("Phone verification input not found.")
             return False
 
+    @staticmethod
+    def _is_send_code_response(response: Response) -> bool:
+        """Matches the API call triggered by 'Send code' (not scripts or captcha assets)."""
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return False
+        url = response.url.lower()
+        return "sms" in url or "verify" in url
+
     def submit_phone(self, phone_number: str) -> str:
         """Enters the phone number and clicks 'Send code'."""
         try:
             self.phone_input.click(timeout=1200)
-            self.phone_input.fill("", timeout=1200)
             jitter_sleep(0.02, 0.06)
             
-            for ch in phone_number:
-                self.phone_input.type(ch, delay=random.randint(6, 18))
+            self.enter_text(self.phone_input, phone_number, event="change")
             jitter_sleep(0.04, 0.08)
 
-            self.send_code_button.first.click(timeout=3000)
+            clicked = False
+            try:
+                with self.page.expect_response(self._is_send_code_response,
+                                               timeout=self.config.SEND_CODE_TIMEOUT_MS) as resp_info:
+                    self.send_code_button.first.click(timeout=3000)
+                    clicked = True
+                    self.log.info("Clicked 'Send code' for phone %s. Waiting for response...", phone_number)
+                status = resp_info.value.status
+                self.log.info("'Send code' for phone %s answered with HTTP %d.", phone_number, status)
+                return f"send_code_response:{status}"
+            except PlaywrightTimeoutError:
+                if not clicked:
+                    raise
             
-            self.log.info("Clicked 'Send code' for phone %s. Waiting 10s...", phone_number)
-            # Wait for 10s as per original logic
-            time.sleep(10)
-            return "send_code_clicked_waited_10s"
+            # No matching request seen; fall back to text that only shows up
+            # after sending (the verification step itself already says "verify")
+            try:
+                self.page.wait_for_selector("text=/code (has been |was )?sent|resend (code )?in/i", timeout=1000)
+                return "send_code_confirmed_on_page"
+            except PlaywrightTimeoutError:
+                self.log.warning("No send-code response or confirmation for phone %s.", phone_number)
+                return "send_code_clicked_no_response"
             
         except Exception as e:
             self.log.exception("Error during phone verification step: %s", e)
@@ -576,20 +872,26 @@ class AccountCreator:
         self.config = config
         self.log = logging.getLogger(f"{self.__class__.__name__}")
         self.account_index = 0
+        self._index_lock = threading.Lock()
+        self._phones_lock = threading.Lock()
+        self._stop = threading.Event()
 
-    def run_single_account(self, phone_number: Optional[str]) -> bool:
+    def run_single_account(self, phone_number: Optional[str],
+                           browser_manager: Optional[BrowserManager] = None) -> bool:
         """Runs the full E2E workflow for one account."""
-        self.account_index += 1
-        account_id = f"[#{self.account_index}]"
+        browser_manager = browser_manager or self.browser_manager
+        with self._index_lock:
+            self.account_index += 1
+            account_id = f"[#{self.account_index}]"
         
         data = self.data_generator.generate_account_data(phone_number)
         notes = "init"
-        context: Optional[BrowserContext] = None
+        page: Optional[Page] = None
         
         self.log.info("%s Starting signup for %s (Phone: %s)", account_id, data.email, data.phone or "<none>")
 
         try:
-            context = self.browser_manager.new_context()
+            context = browser_manager.get_or_create_shared_context()
             page = context.new_page()
             
             signup_page = SignUpPage(page, self.config)
@@ -618,7 +920,7 @@ class AccountCreator:
                 try: page.wait_for_load_state("networkidle", timeout=2000)
                 except Exception: pass
                 
-                if "verify" in page.content().lower() or "check your email" in page.content().lower():
+                if page.locator("text=/verify|check your email/i").count() > 0:
                     notes = "verification_prompt_detected_no_phone"
                 elif page.url != self.config.SIGNUP_URL:
                      notes = f"navigated_to:{page.url.split('?')[0]}" # Clean URL
@@ -637,9 +939,12 @@ class AccountCreator:
 
         except Exception as e:
             if "Target closed" in str(e) or "Browser has been closed" in str(e):
-                self.log.error("%s Critical Playwright error: %s. Relaunching browser.", account_id, e)
-                self.browser_manager.shutdown()
-                self.browser_manager.launch()
+                self.log.error("%s Critical Playwright error: %s. Recovering browser.", account_id, e)
+                try:
+                    browser_manager.recover()
+                except Exception as recover_exc:
+                    # Keep the worker alive; the next account retries via new_context()
+                    self.log.error("%s Browser recovery failed: %s", account_id, recover_exc)
             else:
                 self.log.exception("%s Unhandled exception in flow for %s: %s", account_id, data.email, e)
             
@@ -655,24 +960,70 @@ class AccountCreator:
                 "country": data.country, "notes": notes
             })
             
-            if context and not (self.config.KEEP_BROWSER_OPEN_ON_SUCCESS and not self.config.HEADLESS):
-                self.browser_manager.close_context(context)
+            if page and not (self.config.KEEP_BROWSER_OPEN_ON_SUCCESS and not self.config.HEADLESS):
+                browser_manager.reset_shared_context(page)
+                browser_manager.close_page(page)
 
         return True # Continue loop even on failure
 
-    def run(self, phone_numbers: List[str]):
+    def _next_phone(self, phones: Iterator[str]) -> Optional[str]:
+        """Hands out the next number; safe to call from any worker."""
+        with self._phones_lock:
+            return next(phones, None)
+
+    def _work(self, phones: Iterator[str], browser_manager: BrowserManager):
+        """Worker loop: processes numbers until the queue is drained or stopped."""
+        while not self._stop.is_set():
+            phone = self._next_phone(phones)
+            if phone is None:
+                return
+            if not self.run_single_account(phone_number=phone, browser_manager=browser_manager):
+                self.log.info("Stopping loop (KEEP_BROWSER_OPEN).")
+                self._stop.set()
+                return
+            jitter_sleep(0.2, 0.6) # Delay between accounts
+
+    def _work_in_thread(self, phones: Iterator[str]):
+        """Pool worker. Sync Playwright objects are thread-bound, so it runs its
+        own driver and attaches to the main browser over CDP."""
+        try:
+            with sync_playwright() as pw:
+                browser_manager = BrowserManager(
+                    pw, self.config, cdp_endpoint=self.browser_manager.debugging_endpoint
+                )
+                try:
+                    browser_manager.launch()
+                    self._work(phones, browser_manager)
+                finally:
+                    browser_manager.shutdown()
+        except Exception as e:
+            self.log.exception("Worker thread failed: %s", e)
+
+    def run(self, phone_numbers: Iterable[str]):
         """Runs the creation loop for all provided phone numbers."""
-        if not phone_numbers:
+        phones = iter(phone_numbers)
+        first = next(phones, None)
+        if first is None:
             self.log.info("No phone numbers loaded. Running one account without a phone number.")
             self.run_single_account(phone_number=None)
-        else:
-            self.log.info("Starting batch job for %d phone numbers.", len(phone_numbers))
-            for phone in phone_numbers:
-                continue_loop = self.run_single_account(phone_number=phone)
-                if not continue_loop:
-                    self.log.info("Stopping loop (KEEP_BROWSER_OPEN).")
-                    break
-                jitter_sleep(0.2, 0.6) # Delay between accounts
+            return
+
+        phones = itertools.chain([first], phones)
+        workers = max(1, self.config.MAX_WORKERS)
+        self.log.info("Starting batch job (%d workers).", workers)
+        started_at = self.account_index
+        self._stop.clear()
+
+        # The calling thread works too, using the injected browser manager
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in range(workers - 1):
+                pool.submit(self._work_in_thread, phones)
+            try:
+                self._work(phones, self.browser_manager)
+            finally:
+                self._stop.set()
+
+        self.log.info("Batch job done: %d phone numbers processed.", self.account_index - started_at)
 
 # --- Main Execution ---
 
@@ -683,7 +1034,8 @@ def main():
     logger = setup_logging(config.LOG_FILE)
     logger.info("--- Bot session started ---")
 
-    phone_numbers = read_numbers_file(config.NUMBERS_FILE)
+    phone_numbers = iter_numbers_file(config.NUMBERS_FILE, logger)
+    output_writer: Optional[IOutputWriter] = None
 
     try:
         with sync_playwright() as pw:
@@ -713,6 +1065,8 @@ def main():
         traceback.print_exc()
         sys.exit(1)
     finally:
+        if output_writer:
+            output_writer.close()
         logger.info("--- Bot session ended ---")
 
 if __name__ == "__main__":